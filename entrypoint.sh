@@ -0,0 +1,17 @@
+#!/bin/sh
+# Script de entrada para o container do backend
+set -e
+
+# Resolve o Python do virtualenv do Poetry uma única vez (cada `poetry run` custa ~1s)
+PYTHON="$(poetry env info --executable 2>/dev/null || command -v python)"
+
+"$PYTHON" manage.py wait_for_db --timeout "${DB_WAIT_TIMEOUT:-30}"
+
+# Só roda `migrate` se houver migrações pendentes; `makemigrations` nunca roda em runtime
+"$PYTHON" manage.py migrate_if_needed
+
+# FAST_BOOT=1 desliga o autoreloader, que sobe um segundo processo e varre os arquivos
+if [ "${FAST_BOOT:-0}" = "1" ]; then
+  exec "$PYTHON" manage.py runserver 0.0.0.0:80 --noreload
+fi
+exec "$PYTHON" manage.py runserver 0.0.0.0:80
@@ -0,0 +1,25 @@
+#!/bin/sh
+# Mede o tempo até a primeira resposta do container web (docker compose).
+# Rode no commit antigo e no atual para comparar; /admin/login/ existe nos dois.
+# Uso: ./measure_boot.sh [execuções]   (FAST_BOOT=1 ./measure_boot.sh para o modo rápido)
+set -e
+
+RUNS="${1:-5}"
+URL="${BOOT_URL:-http://localhost:80/admin/login/}"
+
+docker compose build web >/dev/null
+docker compose up -d db >/dev/null
+# Primeira subida aplica as migrações; as medições são de reinícios com o banco pronto
+docker compose up -d --no-deps web >/dev/null
+until curl -fs -o /dev/null "$URL"; do sleep 0.5; done
+
+i=1
+while [ "$i" -le "$RUNS" ]; do
+  docker compose rm -sf web >/dev/null 2>&1
+  start=$(date +%s.%N)
+  docker compose up -d --no-deps web >/dev/null 2>&1
+  until curl -fs -o /dev/null "$URL"; do sleep 0.05; done
+  end=$(date +%s.%N)
+  awk -v i="$i" -v s="$start" -v e="$end" 'BEGIN { printf "execução %d: %.2fs\n", i, e - s }'
+  i=$((i + 1))
+done
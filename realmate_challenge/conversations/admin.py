@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Conversation, Message, WebhookLog
+from django.db.models.functions import Substr
+from .models import ArchivedConversation, Conversation, Message, WebhookLog
+from .paginators import EstimatedCountPaginator
 
 
 @admin.register(Conversation)
@@ -10,27 +12,110 @@ class ConversationAdmin(admin.ModelAdmin):
     readonly_fields = ('id', 'created_at', 'updated_at')
 
 
+PREVIEW_LENGTH = 50
+
+
+def _preview(text):
+    """Formata o prefixo já truncado pelo banco (PREVIEW_LENGTH + 1 caracteres)."""
+    return text[:PREVIEW_LENGTH] + '...' if len(text) > PREVIEW_LENGTH else text
+
+
+class WebhookLogEventFilter(admin.SimpleListFilter):
+    """Filtro com opções fixas, evitando o SELECT DISTINCT sobre a tabela inteira."""
+    title = 'evento'
+    parameter_name = 'event'
+
+    KNOWN_EVENTS = ('NEW_CONVERSATION', 'NEW_MESSAGE', 'CLOSE_CONVERSATION', 'UNKNOWN')
+    OTHER = 'OTHER'
+
+    def lookups(self, request, model_admin):
+        # Tipos desconhecidos são logados com o valor bruto recebido; ficam em "Outros"
+        return [(event, event) for event in self.KNOWN_EVENTS] + [(self.OTHER, 'Outros')]
+
+    def queryset(self, request, queryset):
+        if self.value() == self.OTHER:
+            return queryset.exclude(event__in=self.KNOWN_EVENTS)
+        if self.value():
+            return queryset.filter(event=self.value())
+        return queryset
+
+
+class WebhookLogStatusFilter(admin.SimpleListFilter):
+    """Filtro com opções fixas, evitando o SELECT DISTINCT sobre a tabela inteira."""
+    title = 'status'
+    parameter_name = 'status'
+
+    def lookups(self, request, model_admin):
+        return [
+            ('success', 'success'),
+            ('error', 'error'),
+        ]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(status=self.value())
+        return queryset
+
+
 @admin.register(Message)
 class MessageAdmin(admin.ModelAdmin):
     list_display = ('id', 'conversation', 'direction', 'timestamp', 'content_preview')
     list_filter = ('direction', 'timestamp')
-    search_fields = ('id', 'content', 'conversation__id')
+    list_select_related = ('conversation',)
+    # Só buscas exatas por chaves indexadas; ILIKE em `content` varreria a tabela inteira
+    search_fields = ('=id', '=conversation__id')
     readonly_fields = ('id', 'timestamp')
-    
+    ordering = ('-timestamp',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        # Carrega só o início do conteúdo para a listagem
+        return super().get_queryset(request).defer('content').annotate(
+            content_head=Substr('content', 1, PREVIEW_LENGTH + 1)
+        )
+
     def content_preview(self, obj):
-        return obj.content[:50] + '...' if len(obj.content) > 50 else obj.content
+        return _preview(obj.content_head)
     content_preview.short_description = 'Conteúdo'
 
 
 @admin.register(WebhookLog)
 class WebhookLogAdmin(admin.ModelAdmin):
     list_display = ('event', 'conversation_id', 'status', 'timestamp', 'message_preview')
-    list_filter = ('event', 'status', 'timestamp')
-    search_fields = ('event', 'message', 'conversation_id')
+    list_filter = (WebhookLogEventFilter, WebhookLogStatusFilter, 'timestamp')
+    # Só buscas exatas por chaves indexadas; ILIKE em `message` varreria a tabela inteira
+    search_fields = ('=conversation_id',)
     readonly_fields = ('timestamp',)
     ordering = ('-timestamp',)
-    
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        # Carrega só o início da mensagem para a listagem
+        return super().get_queryset(request).defer('message').annotate(
+            message_head=Substr('message', 1, PREVIEW_LENGTH + 1)
+        )
+
     def message_preview(self, obj):
-        return obj.message[:50] + '...' if len(obj.message) > 50 else obj.message
+        return _preview(obj.message_head)
     message_preview.short_description = 'Mensagem'
 
+
+@admin.register(ArchivedConversation)
+class ArchivedConversationAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'message_count', 'updated_at', 'archived_at')
+    search_fields = ('id',)
+    readonly_fields = ('id', 'status', 'created_at', 'updated_at', 'archived_at', 'message_count')
+    exclude = ('payload',)
+
+    def get_queryset(self, request):
+        # O blob pode ser grande e não é exibido na listagem nem no detalhe
+        return super().get_queryset(request).defer('payload')
+
+    def has_add_permission(self, request):
+        # Arquivos só são criados pelo comando archive_conversations
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conversations', '0003_alter_conversation_status_alter_message_direction'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedConversation',
+            fields=[
+                ('id', models.UUIDField(primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('OPEN', 'Aberta'), ('CLOSED', 'Fechada')], default='CLOSED', max_length=10)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('message_count', models.PositiveIntegerField(default=0)),
+                ('payload', models.BinaryField()),
+            ],
+            options={
+                'verbose_name': 'Conversa arquivada',
+                'verbose_name_plural': 'Conversas arquivadas',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='conversation',
+            index=models.Index(fields=['status', 'updated_at'], name='conversation_status_upd_idx'),
+        ),
+    ]
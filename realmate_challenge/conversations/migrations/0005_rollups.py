@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conversations', '0004_archivedconversation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConversationActivityRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('MINUTE', 'Minuto'), ('HOUR', 'Hora')], max_length=10)),
+                ('bucket_start', models.DateTimeField()),
+                ('opened', models.PositiveBigIntegerField(default=0)),
+                ('closed', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Atividade de conversas',
+                'verbose_name_plural': 'Atividade de conversas',
+                'constraints': [models.UniqueConstraint(fields=('granularity', 'bucket_start'), name='unique_conversation_activity_bucket')],
+            },
+        ),
+        migrations.CreateModel(
+            name='MessageVolumeRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('MINUTE', 'Minuto'), ('HOUR', 'Hora')], max_length=10)),
+                ('bucket_start', models.DateTimeField()),
+                ('direction', models.CharField(choices=[('SENT', 'Enviada'), ('RECEIVED', 'Recebida')], max_length=10)),
+                ('count', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Volume de mensagens',
+                'verbose_name_plural': 'Volumes de mensagens',
+                'constraints': [models.UniqueConstraint(fields=('granularity', 'bucket_start', 'direction'), name='unique_message_volume_bucket')],
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:50
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+from django.db.migrations.operations import AddIndex
+
+
+class AddIndexConcurrentlyIfPostgres(AddIndexConcurrently):
+    """CREATE INDEX CONCURRENTLY no Postgres (sem bloquear escritas); AddIndex comum nos demais bancos."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY não pode rodar dentro de uma transação
+    atomic = False
+
+    dependencies = [
+        ('conversations', '0005_rollups'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfPostgres(
+            model_name='message',
+            index=models.Index(fields=['timestamp'], name='message_timestamp_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='message',
+            index=models.Index(fields=['direction', 'timestamp'], name='message_direction_ts_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='webhooklog',
+            index=models.Index(fields=['timestamp'], name='webhooklog_timestamp_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='webhooklog',
+            index=models.Index(fields=['status', 'timestamp'], name='webhooklog_status_ts_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='webhooklog',
+            index=models.Index(fields=['event', 'timestamp'], name='webhooklog_event_ts_idx'),
+        ),
+        AddIndexConcurrentlyIfPostgres(
+            model_name='webhooklog',
+            index=models.Index(fields=['conversation_id'], name='webhooklog_conversation_idx'),
+        ),
+    ]
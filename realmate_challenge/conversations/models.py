@@ -12,6 +12,12 @@ class Conversation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Usado por ArchiveService.archivable_ids (status=CLOSED, mais antigas primeiro)
+            models.Index(fields=["status", "updated_at"], name="conversation_status_upd_idx"),
+        ]
+
     def __str__(self):
         return f"Conversa {self.id} ({self.status})"
 
@@ -28,6 +34,12 @@ class Message(models.Model):
     content = models.TextField()
     timestamp = models.DateTimeField()
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["timestamp"], name="message_timestamp_idx"),
+            models.Index(fields=["direction", "timestamp"], name="message_direction_ts_idx"),
+        ]
+
     def __str__(self):
         return f"Mensagem {self.id} ({self.direction})"
 
@@ -42,6 +54,12 @@ class WebhookLog(models.Model):
 
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['timestamp'], name='webhooklog_timestamp_idx'),
+            models.Index(fields=['status', 'timestamp'], name='webhooklog_status_ts_idx'),
+            models.Index(fields=['event', 'timestamp'], name='webhooklog_event_ts_idx'),
+            models.Index(fields=['conversation_id'], name='webhooklog_conversation_idx'),
+        ]
         verbose_name = "Log do Webhook"
         verbose_name_plural = "Logs do Webhook"
 
@@ -49,3 +67,70 @@ class WebhookLog(models.Model):
         return f"{self.event} - {self.status} - {self.timestamp}"
 
 
+class ArchivedConversation(models.Model):
+    """Conversa fechada movida para armazenamento frio.
+
+    As mensagens ficam serializadas em um único blob JSON comprimido com zlib,
+    tirando as linhas da tabela quente de `Message` e de seus índices.
+    """
+    id = models.UUIDField(primary_key=True)
+    status = models.CharField(max_length=10, choices=Conversation.STATUS_CHOICES, default="CLOSED")
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    message_count = models.PositiveIntegerField(default=0)
+    payload = models.BinaryField()
+
+    class Meta:
+        verbose_name = "Conversa arquivada"
+        verbose_name_plural = "Conversas arquivadas"
+
+    def __str__(self):
+        return f"Conversa arquivada {self.id} ({self.message_count} mensagens)"
+
+
+class MessageVolumeRollup(models.Model):
+    """Contagem de mensagens por intervalo de tempo e direção."""
+    GRANULARITY_CHOICES = [
+        ("MINUTE", "Minuto"),
+        ("HOUR", "Hora"),
+    ]
+
+    granularity = models.CharField(max_length=10, choices=GRANULARITY_CHOICES)
+    bucket_start = models.DateTimeField()
+    direction = models.CharField(max_length=10, choices=Message.DIRECTION_CHOICES)
+    count = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["granularity", "bucket_start", "direction"],
+                name="unique_message_volume_bucket",
+            ),
+        ]
+        verbose_name = "Volume de mensagens"
+        verbose_name_plural = "Volumes de mensagens"
+
+    def __str__(self):
+        return f"{self.granularity} {self.bucket_start} {self.direction}: {self.count}"
+
+
+class ConversationActivityRollup(models.Model):
+    """Contagem de conversas abertas e fechadas por intervalo de tempo."""
+    granularity = models.CharField(max_length=10, choices=MessageVolumeRollup.GRANULARITY_CHOICES)
+    bucket_start = models.DateTimeField()
+    opened = models.PositiveBigIntegerField(default=0)
+    closed = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["granularity", "bucket_start"],
+                name="unique_conversation_activity_bucket",
+            ),
+        ]
+        verbose_name = "Atividade de conversas"
+        verbose_name_plural = "Atividade de conversas"
+
+    def __str__(self):
+        return f"{self.granularity} {self.bucket_start}: +{self.opened} -{self.closed}"
@@ -0,0 +1,64 @@
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections, transaction
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator para tabelas grandes que evita `COUNT(*)` completo no Postgres.
+
+    Sem filtros, usa a estimativa de `pg_class.reltuples` mantida pelo
+    ANALYZE. Com filtros, tenta a contagem exata sob `statement_timeout` e,
+    se ela demorar demais, usa a estimativa do planner (`EXPLAIN`) para a
+    query filtrada, limitada a `MAX_ESTIMATED_PAGES` páginas. Em outros
+    bancos, ou para tabelas pequenas, o comportamento é o do Paginator padrão.
+    """
+
+    EXACT_COUNT_THRESHOLD = 10000
+    COUNT_TIMEOUT_MS = 200
+    MAX_ESTIMATED_PAGES = 100
+
+    def _estimate(self):
+        """Número aproximado de linhas da tabela, ou None se não houver estatística."""
+        query = self.object_list.query
+        with connections[self.object_list.db].cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [query.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if not row or row[0] < 0:
+            return None
+        return row[0]
+
+    def _filtered_estimate(self):
+        """Linhas estimadas pelo planner para a query filtrada, limitadas a MAX_ESTIMATED_PAGES páginas."""
+        cap = self.per_page * self.MAX_ESTIMATED_PAGES
+        sql, params = self.object_list.query.sql_with_params()
+        try:
+            with connections[self.object_list.db].cursor() as cursor:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+        except DatabaseError:
+            return cap
+        return min(int(plan[0]["Plan"]["Plan Rows"]), cap)
+
+    @cached_property
+    def count(self):
+        if connections[self.object_list.db].vendor != "postgresql":
+            return self.object_list.count()
+
+        estimate = self._estimate()
+        if estimate is None or estimate < self.EXACT_COUNT_THRESHOLD:
+            return self.object_list.count()
+
+        if not self.object_list.query.where:
+            return estimate
+
+        try:
+            with transaction.atomic(using=self.object_list.db):
+                with connections[self.object_list.db].cursor() as cursor:
+                    cursor.execute(f"SET LOCAL statement_timeout = {self.COUNT_TIMEOUT_MS}")
+                return self.object_list.count()
+        except DatabaseError:
+            return self._filtered_estimate()
@@ -0,0 +1,225 @@
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from rest_framework.response import Response
+from rest_framework import status
+
+try:
+    from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+    CACHE_UNAVAILABLE_ERRORS = (RedisConnectionError, RedisTimeoutError, OSError)
+except ImportError:
+    CACHE_UNAVAILABLE_ERRORS = (OSError,)
+
+logger = logging.getLogger("webhook_service")
+
+DEFAULT_ADMISSION_SETTINGS = {
+    "MIN_CONCURRENCY": 2,
+    "MAX_CONCURRENCY": 32,
+    "TARGET_DB_LATENCY": 0.05,
+    "SATURATED_RETRY_AFTER": 1,
+    "SOURCE_RATE": 50.0,
+    "SOURCE_BURST": 100,
+    "CONVERSATION_RATE": 10.0,
+    "CONVERSATION_BURST": 20,
+    "TRUST_PROXY_HEADERS": False,
+    "CACHE_PREFIX": "webhook:ratelimit",
+}
+
+
+def admission_setting(name):
+    """Lê uma opção de `settings.WEBHOOK_ADMISSION`, com fallback para o padrão."""
+    return getattr(settings, "WEBHOOK_ADMISSION", {}).get(name, DEFAULT_ADMISSION_SETTINGS[name])
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limita requisições simultâneas dentro do processo.
+
+    O limite segue AIMD a partir da latência média das queries: cresce
+    devagar enquanto o banco responde dentro do alvo e cai de forma
+    multiplicativa enquanto a média móvel estiver acima dele.
+    """
+
+    SMOOTHING = 0.2
+    DECREASE_FACTOR = 0.9
+
+    def __init__(self, min_limit, max_limit, target_latency):
+        self._lock = threading.Lock()
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self.latency = None
+
+    def try_acquire(self):
+        with self._lock:
+            if self.in_flight >= int(self.limit):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, db_latency=None):
+        with self._lock:
+            self.in_flight -= 1
+            if db_latency is None:
+                return
+            if self.latency is None:
+                self.latency = db_latency
+            else:
+                self.latency += self.SMOOTHING * (db_latency - self.latency)
+
+            if self.latency > self.target_latency:
+                self.limit = max(self.min_limit, self.limit * self.DECREASE_FACTOR)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+
+class AdmissionService:
+    _limiter = None
+    _limiter_lock = threading.Lock()
+
+    @staticmethod
+    def _get_limiter():
+        """Cria sob demanda o limitador do processo a partir das settings."""
+        if AdmissionService._limiter is None:
+            with AdmissionService._limiter_lock:
+                if AdmissionService._limiter is None:
+                    AdmissionService._limiter = AdaptiveConcurrencyLimiter(
+                        admission_setting("MIN_CONCURRENCY"),
+                        admission_setting("MAX_CONCURRENCY"),
+                        admission_setting("TARGET_DB_LATENCY"),
+                    )
+        return AdmissionService._limiter
+
+    @staticmethod
+    def _reject(status_code, description, retry_after):
+        response = Response({"success": False, "description": description}, status=status_code)
+        response["Retry-After"] = str(max(1, math.ceil(retry_after)))
+        return response
+
+    @staticmethod
+    def _source_key(request):
+        """
+        Identifica a origem da requisição.
+
+        `X-Webhook-Source` e `X-Forwarded-For` são controlados pelo cliente, então
+        só são usados com `TRUST_PROXY_HEADERS` ativo, atrás de um proxy confiável
+        que os sobrescreve. Caso contrário, vale o IP da conexão.
+        """
+        if admission_setting("TRUST_PROXY_HEADERS"):
+            source = request.headers.get("X-Webhook-Source")
+            if source:
+                return source
+            forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+            if forwarded.split(",")[0].strip():
+                return forwarded.split(",")[0].strip()
+        return request.META.get("REMOTE_ADDR", "unknown")
+
+    @staticmethod
+    def _take_token(key, rate, burst):
+        """
+        Consome uma vaga do limite compartilhado via cache do Django.
+
+        Usa janelas fixas de `burst / rate` segundos com até `burst` requisições
+        cada. O contador é criado com `cache.add` e incrementado com `cache.incr`,
+        ambos atômicos no Redis, então workers concorrentes não leem o mesmo saldo.
+
+        Returns:
+            0 se a requisição foi admitida, senão os segundos até a próxima janela
+        """
+        window = burst / rate
+        now = time.time()
+        window_index = int(now // window)
+        cache_key = f"{admission_setting('CACHE_PREFIX')}:{key}:{window_index}"
+        timeout = math.ceil(window) + 1
+        try:
+            cache.add(cache_key, 0, timeout)
+            try:
+                count = cache.incr(cache_key)
+            except ValueError:
+                # A chave expirou entre o add e o incr
+                cache.add(cache_key, 1, timeout)
+                count = 1
+            if count > burst:
+                return (window_index + 1) * window - now
+        except CACHE_UNAVAILABLE_ERRORS as e:
+            # Cache fora do ar não pode derrubar o webhook: deixa passar. Erros de
+            # configuração (backend ausente, etc.) não entram aqui e sobem normalmente
+            logger.warning(f"Cache indisponível para o limite de taxa {cache_key}: {str(e)}")
+        return 0
+
+    @staticmethod
+    def check_rate_limits(request, event_data):
+        """Aplica os limites de taxa por origem e por conversa. Retorna Response 429 ou None."""
+        source = AdmissionService._source_key(request)
+        retry_after = AdmissionService._take_token(
+            f"source:{source}",
+            admission_setting("SOURCE_RATE"),
+            admission_setting("SOURCE_BURST"),
+        )
+        if retry_after:
+            logger.warning(f"Limite de taxa excedido para a origem {source}")
+            return AdmissionService._reject(
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                "Limite de requisições excedido para esta origem",
+                retry_after,
+            )
+
+        data = event_data.get("data")
+        conversation_id = None
+        if isinstance(data, dict):
+            conversation_id = data.get("conversation_id") or data.get("id")
+        if conversation_id:
+            retry_after = AdmissionService._take_token(
+                f"conversation:{conversation_id}",
+                admission_setting("CONVERSATION_RATE"),
+                admission_setting("CONVERSATION_BURST"),
+            )
+            if retry_after:
+                logger.warning(f"Limite de taxa excedido para a conversa {conversation_id}")
+                return AdmissionService._reject(
+                    status.HTTP_429_TOO_MANY_REQUESTS,
+                    f"Limite de requisições excedido para a conversa {conversation_id}",
+                    retry_after,
+                )
+        return None
+
+    @staticmethod
+    @contextmanager
+    def acquire_slot():
+        """
+        Reserva uma vaga no limitador de concorrência.
+
+        Produz None quando admitido, ou uma Response 503 quando saturado.
+        A latência média das queries executadas dentro do bloco realimenta o limite.
+        """
+        limiter = AdmissionService._get_limiter()
+        if not limiter.try_acquire():
+            logger.warning("Webhook saturado, rejeitando requisição")
+            yield AdmissionService._reject(
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                "Serviço temporariamente sobrecarregado",
+                admission_setting("SATURATED_RETRY_AFTER"),
+            )
+            return
+
+        timings = []
+
+        def _timed_query(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                timings.append(time.perf_counter() - start)
+
+        try:
+            with connection.execute_wrapper(_timed_query):
+                yield None
+        finally:
+            limiter.release(sum(timings) / len(timings) if timings else None)
@@ -0,0 +1,85 @@
+import json
+import zlib
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+from ..models import ArchivedConversation, Conversation
+from ..serializers import MessageSerializer
+
+
+class ArchiveService:
+    @staticmethod
+    def compress(messages):
+        """Serializa as mensagens em JSON e comprime com zlib."""
+        raw = json.dumps(messages, separators=(",", ":"), ensure_ascii=False)
+        return zlib.compress(raw.encode("utf-8"), 9)
+
+    @staticmethod
+    def decompress(payload):
+        """Descomprime o blob e retorna a lista de mensagens serializadas."""
+        return json.loads(zlib.decompress(bytes(payload)).decode("utf-8"))
+
+    @staticmethod
+    def archivable_ids(older_than_days, limit):
+        """Retorna IDs de conversas fechadas sem alteração há mais de `older_than_days` dias."""
+        threshold = timezone.now() - timedelta(days=older_than_days)
+        return list(
+            Conversation.objects.filter(status="CLOSED", updated_at__lt=threshold)
+            .order_by("updated_at")
+            .values_list("id", flat=True)[:limit]
+        )
+
+    @staticmethod
+    def archive_conversation(conversation_id):
+        """
+        Move uma conversa fechada e suas mensagens para `ArchivedConversation`.
+
+        Returns:
+            True se a conversa foi arquivada, False se não existe ou não está fechada
+        """
+        with transaction.atomic():
+            conversation = (
+                Conversation.objects.select_for_update()
+                .filter(id=conversation_id, status="CLOSED")
+                .first()
+            )
+            if not conversation:
+                return False
+
+            messages = MessageSerializer(
+                conversation.messages.order_by("timestamp"), many=True
+            ).data
+
+            ArchivedConversation.objects.create(
+                id=conversation.id,
+                status=conversation.status,
+                created_at=conversation.created_at,
+                updated_at=conversation.updated_at,
+                message_count=len(messages),
+                payload=ArchiveService.compress(messages),
+            )
+            # O CASCADE remove as mensagens da tabela quente
+            conversation.delete()
+        return True
+
+    @staticmethod
+    def is_archived(conversation_id):
+        """Indica se a conversa já foi movida para o arquivo."""
+        return ArchivedConversation.objects.filter(id=conversation_id).exists()
+
+    @staticmethod
+    def load(conversation_id):
+        """
+        Reidrata uma conversa arquivada.
+
+        Returns:
+            Dicionário no mesmo formato de `ConversationSerializer`, ou None se não arquivada
+        """
+        archived = ArchivedConversation.objects.filter(id=conversation_id).first()
+        if not archived:
+            return None
+        return {
+            "id": str(archived.id),
+            "status": archived.status,
+            "messages": ArchiveService.decompress(archived.payload),
+        }
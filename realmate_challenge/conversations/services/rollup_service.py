@@ -0,0 +1,174 @@
+import logging
+from collections import Counter
+from datetime import timezone as dt_timezone
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from ..models import ConversationActivityRollup, MessageVolumeRollup
+
+logger = logging.getLogger("webhook_service")
+
+GRANULARITIES = ("MINUTE", "HOUR")
+
+
+class RollupService:
+    @staticmethod
+    def bucket_start(value, granularity):
+        """Trunca um datetime (em UTC) para o início do intervalo."""
+        if timezone.is_naive(value):
+            value = timezone.make_aware(value, dt_timezone.utc)
+        value = value.astimezone(dt_timezone.utc).replace(second=0, microsecond=0)
+        if granularity == "HOUR":
+            value = value.replace(minute=0)
+        return value
+
+    @staticmethod
+    def _increment(model, lookup, increments):
+        """
+        Soma `increments` ({campo: valor}) na linha identificada por `lookup`.
+
+        Tenta primeiro um UPDATE atômico; se a linha ainda não existe, cria.
+        Em caso de corrida na criação, repete o UPDATE.
+        """
+        changes = {field: F(field) + value for field, value in increments.items()}
+        if model.objects.filter(**lookup).update(**changes):
+            return
+        try:
+            with transaction.atomic():
+                model.objects.create(**lookup, **increments)
+        except IntegrityError:
+            model.objects.filter(**lookup).update(**changes)
+
+    @staticmethod
+    def lock_order(key):
+        """
+        Ordem em que as linhas de rollup são travadas: MINUTE antes de HOUR, depois
+        bucket e direção/campo. Webhook e backfill seguem a mesma ordem, o que evita
+        deadlock entre eles.
+        """
+        granularity, bucket, name = key
+        return (GRANULARITIES.index(granularity), bucket, name)
+
+    @staticmethod
+    def _ordered(counts):
+        return sorted(counts.items(), key=lambda item: RollupService.lock_order(item[0]))
+
+    @staticmethod
+    def add_message_counts(counts):
+        """Aplica contagens no formato {(granularidade, bucket, direção): n}."""
+        for (granularity, bucket, direction), value in RollupService._ordered(counts):
+            RollupService._increment(
+                MessageVolumeRollup,
+                {"granularity": granularity, "bucket_start": bucket, "direction": direction},
+                {"count": value},
+            )
+
+    @staticmethod
+    def add_conversation_counts(counts):
+        """Aplica contagens no formato {(granularidade, bucket, 'opened'|'closed'): n}."""
+        for (granularity, bucket, field), value in RollupService._ordered(counts):
+            RollupService._increment(
+                ConversationActivityRollup,
+                {"granularity": granularity, "bucket_start": bucket},
+                {field: value},
+            )
+
+    @staticmethod
+    def count_messages(rows):
+        """Agrupa pares (timestamp, direção) nas chaves usadas por `add_message_counts`."""
+        counts = Counter()
+        for timestamp, direction in rows:
+            for granularity in GRANULARITIES:
+                counts[(granularity, RollupService.bucket_start(timestamp, granularity), direction)] += 1
+        return counts
+
+    @staticmethod
+    def count_conversations(rows):
+        """Agrupa pares (timestamp, 'opened'|'closed') nas chaves usadas por `add_conversation_counts`."""
+        counts = Counter()
+        for timestamp, field in rows:
+            for granularity in GRANULARITIES:
+                counts[(granularity, RollupService.bucket_start(timestamp, granularity), field)] += 1
+        return counts
+
+    @staticmethod
+    def _apply(func):
+        """
+        Executa `func` na transação corrente, dentro de um savepoint.
+
+        O incremento é gravado no mesmo commit da linha que o originou, o que
+        permite ao backfill reconciliar os rollups a partir de um snapshot.
+        Falhas no rollup são registradas e não quebram o webhook; a próxima
+        execução do backfill corrige a contagem que ficou faltando.
+
+        Todas as mensagens de uma mesma hora atualizam a mesma linha HOUR dentro
+        da transação do INSERT, então essa linha serializa os inserts daquela
+        hora pelo tempo de um UPDATE + COMMIT.
+        """
+        try:
+            with transaction.atomic():
+                func()
+        except Exception as e:
+            logger.error(f"Erro ao atualizar rollups: {str(e)}")
+
+    @staticmethod
+    def record_message(timestamp, direction):
+        RollupService._apply(
+            lambda: RollupService.add_message_counts(
+                RollupService.count_messages([(timestamp, direction)])
+            )
+        )
+
+    @staticmethod
+    def record_conversation_opened(timestamp):
+        RollupService._apply(
+            lambda: RollupService.add_conversation_counts(
+                RollupService.count_conversations([(timestamp, "opened")])
+            )
+        )
+
+    @staticmethod
+    def record_conversation_closed(timestamp):
+        RollupService._apply(
+            lambda: RollupService.add_conversation_counts(
+                RollupService.count_conversations([(timestamp, "closed")])
+            )
+        )
+
+    @staticmethod
+    def query(granularity, start, end):
+        """
+        Consulta os rollups no intervalo [start, end).
+
+        Returns:
+            Dicionário com as séries de mensagens por direção e de conversas abertas/fechadas
+        """
+        messages = {}
+        for bucket, direction, count in (
+            MessageVolumeRollup.objects.filter(
+                granularity=granularity, bucket_start__gte=start, bucket_start__lt=end
+            )
+            .order_by("bucket_start")
+            .values_list("bucket_start", "direction", "count")
+        ):
+            entry = messages.setdefault(bucket, {"bucket": bucket, "SENT": 0, "RECEIVED": 0})
+            entry[direction] = count
+
+        conversations = [
+            {"bucket": bucket, "opened": opened, "closed": closed}
+            for bucket, opened, closed in (
+                ConversationActivityRollup.objects.filter(
+                    granularity=granularity, bucket_start__gte=start, bucket_start__lt=end
+                )
+                .order_by("bucket_start")
+                .values_list("bucket_start", "opened", "closed")
+            )
+        ]
+
+        return {
+            "granularity": granularity,
+            "start": start,
+            "end": end,
+            "messages": list(messages.values()),
+            "conversations": conversations,
+        }
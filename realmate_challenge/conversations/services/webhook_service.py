@@ -1,8 +1,10 @@
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.utils.dateparse import parse_datetime
 from rest_framework.response import Response
 from rest_framework import status
 from ..models import Conversation, Message, WebhookLog
+from .archive_service import ArchiveService
+from .rollup_service import RollupService
 
 
 class WebhookService:
@@ -147,7 +149,15 @@ class WebhookService:
     def _handle_new_conversation(data):
         """Processa evento NEW_CONVERSATION."""
         conversation_id = data["id"]
-        conversation, created = Conversation.objects.get_or_create(id=conversation_id)
+        with transaction.atomic():
+            conversation, created = Conversation.objects.get_or_create(id=conversation_id)
+            # Re-checa o arquivo dentro da transação: se a conversa foi arquivada antes
+            # do INSERT, a linha recém-criada é descartada para não esconder o arquivo
+            if created and ArchiveService.is_archived(conversation_id):
+                transaction.set_rollback(True)
+                created = False
+            elif created:
+                RollupService.record_conversation_opened(conversation.created_at)
         
         if created:
             WebhookService._log_event(
@@ -172,6 +182,16 @@ class WebhookService:
         conversation_id = data["id"]
         conversation = Conversation.objects.filter(id=conversation_id).first()
         
+        if not conversation and ArchiveService.is_archived(conversation_id):
+            # Conversas arquivadas já estão fechadas
+            WebhookService._log_event(
+                "CLOSE_CONVERSATION",
+                conversation_id=conversation_id,
+                status_value="success",
+                message=f"Conversa {conversation_id} fechada com sucesso"
+            )
+            return Response({"success": True, "message": "Conversa fechada com sucesso"}, status=status.HTTP_200_OK)
+        
         if not conversation:
             WebhookService._log_event(
                 "CLOSE_CONVERSATION",
@@ -184,8 +204,13 @@ class WebhookService:
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        conversation.status = "CLOSED"
-        conversation.save()
+        # Só grava se a conversa estava aberta: uma conversa já fechada pode ser
+        # arquivada a qualquer momento, e o save() a recriaria na tabela quente
+        if conversation.status != "CLOSED":
+            with transaction.atomic():
+                conversation.status = "CLOSED"
+                conversation.save()
+                RollupService.record_conversation_closed(conversation.updated_at)
         
         WebhookService._log_event(
             "CLOSE_CONVERSATION",
@@ -206,6 +231,19 @@ class WebhookService:
         
         conversation = Conversation.objects.filter(id=conversation_id).first()
         
+        if not conversation and ArchiveService.is_archived(conversation_id):
+            # Conversas arquivadas estão sempre fechadas
+            WebhookService._log_event(
+                "NEW_MESSAGE",
+                conversation_id=conversation_id,
+                status_value="error",
+                message=f"Não é possível adicionar mensagem à conversa fechada {conversation_id}"
+            )
+            return Response(
+                {"success": False, "description": f"Não é possível adicionar mensagem à conversa fechada {conversation_id}"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
         if not conversation:
             WebhookService._log_event(
                 "NEW_MESSAGE",
@@ -232,13 +270,15 @@ class WebhookService:
         
         parsed_timestamp = WebhookService._parse_timestamp(timestamp)
         
-        Message.objects.create(
-            id=message_id,
-            conversation=conversation,
-            direction=direction,
-            content=content,
-            timestamp=parsed_timestamp,
-        )
+        with transaction.atomic():
+            Message.objects.create(
+                id=message_id,
+                conversation=conversation,
+                direction=direction,
+                content=content,
+                timestamp=parsed_timestamp,
+            )
+            RollupService.record_message(parsed_timestamp, direction)
         
         WebhookService._log_event(
             "NEW_MESSAGE",
@@ -1,10 +1,11 @@
 from django.urls import path
-from .views import WebhookView, ConversationDetailView, ConversationListView
+from .views import WebhookView, ConversationDetailView, ConversationListView, AnalyticsView
 
 urlpatterns = [
     path("webhook/", WebhookView.as_view()),
     path("conversations/", ConversationListView.as_view()),
     path("conversations/<uuid:id>/", ConversationDetailView.as_view()),
+    path("analytics/", AnalyticsView.as_view()),
 ]
 
 
@@ -3,8 +3,14 @@ from rest_framework.views import APIView
 from rest_framework.generics import RetrieveAPIView, ListAPIView
 from rest_framework.response import Response
 from rest_framework import status
+from datetime import timedelta
+from django.http import Http404
+from django.utils.dateparse import parse_datetime
 from .models import Conversation
 from .serializers import ConversationSerializer
+from .services.admission_service import AdmissionService
+from .services.archive_service import ArchiveService
+from .services.rollup_service import GRANULARITIES, RollupService
 from .services.webhook_service import WebhookService
 
 
@@ -21,7 +27,14 @@ class WebhookView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            return WebhookService.process_event(request.data)
+            rejection = AdmissionService.check_rate_limits(request, request.data)
+            if rejection is not None:
+                return rejection
+            
+            with AdmissionService.acquire_slot() as rejection:
+                if rejection is not None:
+                    return rejection
+                return WebhookService.process_event(request.data)
         
         except Exception as e:
             # Capturar qualquer exceção não tratada para evitar código 500
@@ -41,10 +54,63 @@ class ConversationListView(ListAPIView):
 
 
 class ConversationDetailView(RetrieveAPIView):
-    """Retorna detalhes de uma conversa específica."""
+    """Retorna detalhes de uma conversa específica, inclusive as arquivadas."""
     
     queryset = Conversation.objects.prefetch_related("messages")
     serializer_class = ConversationSerializer
     lookup_field = "id"
 
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            # Conversas fechadas antigas vivem no armazenamento frio
+            archived = ArchiveService.load(kwargs[self.lookup_field])
+            if archived is None:
+                raise
+            return Response(archived)
+
+
+class AnalyticsView(APIView):
+    """Séries de volume de mensagens e de abertura/fechamento de conversas, lidas dos rollups."""
+
+    MAX_BUCKETS = 10000
+    BUCKET_SIZES = {"MINUTE": timedelta(minutes=1), "HOUR": timedelta(hours=1)}
+
+    def get(self, request):
+        granularity = request.query_params.get("granularity", "HOUR").upper()
+        if granularity not in GRANULARITIES:
+            return Response(
+                {"success": False, "description": f"Granularidade inválida: {granularity}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            start = parse_datetime(request.query_params.get("start", ""))
+            end = parse_datetime(request.query_params.get("end", ""))
+        except ValueError as e:
+            # Formato válido mas data inexistente (ex.: 2025-02-30 ou offset +99:00)
+            return Response(
+                {"success": False, "description": f"Data inválida: {str(e)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if start is None or end is None:
+            return Response(
+                {"success": False, "description": "Os parâmetros 'start' e 'end' são obrigatórios (ISO 8601)"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        start = RollupService.bucket_start(start, granularity)
+        end = RollupService.bucket_start(end, granularity)
+        if end <= start:
+            return Response(
+                {"success": False, "description": "'end' deve ser posterior a 'start'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if (end - start) / self.BUCKET_SIZES[granularity] > self.MAX_BUCKETS:
+            return Response(
+                {"success": False, "description": f"Intervalo excede o máximo de {self.MAX_BUCKETS} buckets"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
+        return Response(RollupService.query(granularity, start, end))
@@ -0,0 +1,47 @@
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.migrations.executor import MigrationExecutor
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+
+def pending_migrations(using=DEFAULT_DB_ALIAS):
+    """Lista as migrações ainda não aplicadas (uma query em `django_migrations`)."""
+    executor = MigrationExecutor(connections[using])
+    return executor.migration_plan(executor.loader.graph.leaf_nodes())
+
+
+class HealthzView(APIView):
+    """Liveness: o processo está de pé e respondendo. Não acessa o banco."""
+    authentication_classes = []
+    permission_classes = []
+
+    def get(self, request):
+        return Response({"status": "ok"})
+
+
+class ReadyzView(APIView):
+    """Readiness: banco acessível e migrações aplicadas."""
+    authentication_classes = []
+    permission_classes = []
+
+    # Depois que as migrações foram vistas como aplicadas, não é preciso conferir de novo
+    migrations_applied = False
+
+    def get(self, request):
+        try:
+            with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+                cursor.execute("SELECT 1")
+            if not ReadyzView.migrations_applied:
+                if pending_migrations():
+                    return Response(
+                        {"status": "unavailable", "description": "Migrações pendentes"},
+                        status=status.HTTP_503_SERVICE_UNAVAILABLE
+                    )
+                ReadyzView.migrations_applied = True
+        except DatabaseError as e:
+            return Response(
+                {"status": "unavailable", "description": f"Banco de dados indisponível: {str(e)}"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        return Response({"status": "ok"})
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from realmate_challenge.conversations.services.archive_service import ArchiveService
+
+
+class Command(BaseCommand):
+    """Move conversas fechadas antigas para o armazenamento frio (`ArchivedConversation`)."""
+    help = "Arquiva conversas fechadas há mais de N dias, comprimindo suas mensagens."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days", type=int, default=30,
+            help="Idade mínima (em dias desde a última alteração) da conversa fechada.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=500,
+            help="Quantidade de conversas selecionadas por lote.",
+        )
+        parser.add_argument(
+            "--limit", type=int, default=None,
+            help="Número máximo de conversas a arquivar nesta execução.",
+        )
+
+    def handle(self, *args, **options):
+        older_than_days = options["older_than_days"]
+        batch_size = options["batch_size"]
+        limit = options["limit"]
+        archived = 0
+
+        self.stdout.write(f"📦 Arquivando conversas fechadas há mais de {older_than_days} dias...")
+        while limit is None or archived < limit:
+            size = batch_size if limit is None else min(batch_size, limit - archived)
+            ids = ArchiveService.archivable_ids(older_than_days, size)
+            if not ids:
+                break
+            batch_archived = sum(1 for conversation_id in ids if ArchiveService.archive_conversation(conversation_id))
+            archived += batch_archived
+            self.stdout.write(f"Lote concluído: {batch_archived} conversas arquivadas (total {archived}).")
+            if batch_archived == 0:
+                break
+
+        self.stdout.write(self.style.SUCCESS(f"✅ {archived} conversas arquivadas!"))
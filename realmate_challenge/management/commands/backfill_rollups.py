@@ -0,0 +1,139 @@
+from collections import Counter
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils.dateparse import parse_datetime
+from realmate_challenge.conversations.models import (
+    ArchivedConversation,
+    Conversation,
+    ConversationActivityRollup,
+    Message,
+    MessageVolumeRollup,
+)
+from realmate_challenge.conversations.services.archive_service import ArchiveService
+from realmate_challenge.conversations.services.rollup_service import RollupService
+
+
+class Command(BaseCommand):
+    """
+    Reconstrói as tabelas de rollup a partir das linhas existentes, em lotes.
+
+    A varredura roda em um único snapshot (REPEATABLE READ no Postgres), que
+    também lê os rollups atuais. Como o webhook grava cada incremento no mesmo
+    commit da linha que o originou, `recalculado - rollup_no_snapshot` é
+    exatamente a correção a aplicar: eventos posteriores ao snapshot ficam nos
+    rollups e não entram na varredura. Nada é apagado: as correções são somadas
+    em lotes pequenos, na mesma ordem de travamento do webhook
+    (`RollupService.lock_order`), para não causar deadlock com inserts em
+    andamento. Enquanto os lotes são aplicados, `/analytics/` pode ver parte das
+    correções.
+    """
+    help = "Recalcula os rollups de mensagens e conversas (inclusive arquivadas)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size", type=int, default=5000,
+            help="Quantidade de linhas lidas por lote.",
+        )
+        parser.add_argument(
+            "--apply-batch-size", type=int, default=100,
+            help="Quantidade de buckets corrigidos por transação.",
+        )
+
+    def _chunks(self, queryset, fields, chunk_size):
+        """Percorre o queryset por keyset no `id`, produzindo listas de tuplas."""
+        last_id = None
+        while True:
+            page = queryset.order_by("id")
+            if last_id is not None:
+                page = page.filter(id__gt=last_id)
+            rows = list(page.values_list("id", *fields)[:chunk_size])
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield rows
+
+    def _scan(self, chunk_size):
+        """Recalcula as contagens e lê os rollups atuais, tudo no mesmo snapshot."""
+        message_counts = Counter()
+        conversation_counts = Counter()
+
+        current_messages = {
+            (granularity, bucket, direction): count
+            for granularity, bucket, direction, count in MessageVolumeRollup.objects.values_list(
+                "granularity", "bucket_start", "direction", "count"
+            )
+        }
+        current_conversations = {}
+        for granularity, bucket, opened, closed in ConversationActivityRollup.objects.values_list(
+            "granularity", "bucket_start", "opened", "closed"
+        ):
+            current_conversations[(granularity, bucket, "opened")] = opened
+            current_conversations[(granularity, bucket, "closed")] = closed
+
+        total = 0
+        for rows in self._chunks(Message.objects.all(), ("timestamp", "direction"), chunk_size):
+            message_counts.update(
+                RollupService.count_messages((timestamp, direction) for _, timestamp, direction in rows)
+            )
+            total += len(rows)
+            self.stdout.write(f"Mensagens processadas: {total}")
+
+        total = 0
+        for rows in self._chunks(Conversation.objects.all(), ("status", "created_at", "updated_at"), chunk_size):
+            events = [(created_at, "opened") for _, _, created_at, _ in rows]
+            events += [(updated_at, "closed") for _, status, _, updated_at in rows if status == "CLOSED"]
+            conversation_counts.update(RollupService.count_conversations(events))
+            total += len(rows)
+            self.stdout.write(f"Conversas processadas: {total}")
+
+        # Conversas arquivadas não têm mais linhas em Message; as mensagens vêm do blob
+        total = 0
+        for rows in self._chunks(ArchivedConversation.objects.all(), ("created_at", "updated_at", "payload"), chunk_size):
+            events = []
+            messages = []
+            for _, created_at, updated_at, payload in rows:
+                events += [(created_at, "opened"), (updated_at, "closed")]
+                messages += [
+                    (parse_datetime(message["timestamp"]), message["direction"])
+                    for message in ArchiveService.decompress(payload)
+                ]
+            conversation_counts.update(RollupService.count_conversations(events))
+            message_counts.update(RollupService.count_messages(messages))
+            total += len(rows)
+            self.stdout.write(f"Conversas arquivadas processadas: {total}")
+
+        return message_counts, current_messages, conversation_counts, current_conversations
+
+    @staticmethod
+    def _delta(expected, current):
+        """Correção por chave: quanto somar ao rollup para chegar ao recalculado."""
+        keys = set(expected) | set(current)
+        delta = {key: expected.get(key, 0) - current.get(key, 0) for key in keys}
+        return {key: value for key, value in delta.items() if value}
+
+    @staticmethod
+    def _apply_in_batches(apply, delta, batch_size):
+        """Aplica as correções em transações curtas, na ordem de travamento do webhook."""
+        keys = sorted(delta, key=RollupService.lock_order)
+        for start in range(0, len(keys), batch_size):
+            with transaction.atomic():
+                apply({key: delta[key] for key in keys[start:start + batch_size]})
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+
+        self.stdout.write("📸 Recalculando rollups a partir de um snapshot...")
+        with transaction.atomic():
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+            message_counts, current_messages, conversation_counts, current_conversations = self._scan(chunk_size)
+
+        message_delta = self._delta(message_counts, current_messages)
+        conversation_delta = self._delta(conversation_counts, current_conversations)
+        self._apply_in_batches(RollupService.add_message_counts, message_delta, options["apply_batch_size"])
+        self._apply_in_batches(RollupService.add_conversation_counts, conversation_delta, options["apply_batch_size"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Rollups reconstruídos! {len(message_delta) + len(conversation_delta)} buckets corrigidos."
+        ))
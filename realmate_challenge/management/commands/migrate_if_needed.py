@@ -0,0 +1,14 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from realmate_challenge.health import pending_migrations
+
+
+class Command(BaseCommand):
+    """Executa `migrate` apenas se houver migrações pendentes."""
+    help = "Aplica migrações somente quando o banco não está atualizado."
+
+    def handle(self, *args, **options):
+        if not pending_migrations():
+            self.stdout.write(self.style.SUCCESS("✅ Migrações já aplicadas, pulando migrate."))
+            return
+        call_command("migrate", interactive=False, verbosity=options["verbosity"])
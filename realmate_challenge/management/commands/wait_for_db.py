@@ -1,20 +1,41 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.db import connections
 from django.db.utils import OperationalError
 import time
 
 class Command(BaseCommand):
     """Comando customizado para aguardar o banco de dados antes de executar migrações."""
-    help = "Espera o banco de dados estar disponível."
+    help = "Espera o banco de dados estar disponível (backoff exponencial com prazo máximo)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--timeout", type=float, default=30.0,
+            help="Prazo máximo de espera, em segundos.",
+        )
+        parser.add_argument(
+            "--initial-delay", type=float, default=0.05,
+            help="Intervalo inicial entre tentativas, em segundos.",
+        )
+        parser.add_argument(
+            "--max-delay", type=float, default=2.0,
+            help="Intervalo máximo entre tentativas, em segundos.",
+        )
 
     def handle(self, *args, **options):
         self.stdout.write("⏳ Aguardando o banco de dados estar disponível...")
-        db_conn = None
-        while not db_conn:
+        deadline = time.monotonic() + options["timeout"]
+        delay = options["initial_delay"]
+        db_conn = connections['default']
+        while True:
             try:
-                db_conn = connections['default']
-                db_conn.cursor()
+                db_conn.ensure_connection()
+                break
             except OperationalError:
-                self.stdout.write("Banco de dados indisponível, tentando novamente em 1s...")
-                time.sleep(1)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise CommandError(f"Banco de dados indisponível após {options['timeout']}s")
+                delay = min(delay, remaining)
+                self.stdout.write(f"Banco de dados indisponível, tentando novamente em {delay:.2f}s...")
+                time.sleep(delay)
+                delay = min(delay * 2, options["max_delay"])
         self.stdout.write(self.style.SUCCESS("✅ Banco de dados disponível!"))
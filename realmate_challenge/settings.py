@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 import os
 from pathlib import Path
+from django.core.exceptions import ImproperlyConfigured
 from urllib.parse import urlparse
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -113,6 +114,46 @@ else:
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Os limites de taxa do webhook ficam no cache; use REDIS_URL para compartilhá-los entre workers.
+
+_REDIS_URL = os.getenv('REDIS_URL')
+if _REDIS_URL:
+    # Sem o cliente, toda operação de cache falharia e os limites de taxa deixariam tudo passar
+    try:
+        import redis  # noqa: F401
+    except ImportError as e:
+        raise ImproperlyConfigured("REDIS_URL definido, mas o pacote 'redis' não está instalado") from e
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': _REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
+# Admission control do webhook (limite de concorrência por processo e limites de taxa compartilhados)
+# TRUST_PROXY_HEADERS só deve ser ativado atrás de um proxy que sobrescreve X-Forwarded-For/X-Webhook-Source
+
+WEBHOOK_ADMISSION = {
+    'MIN_CONCURRENCY': int(os.getenv('WEBHOOK_MIN_CONCURRENCY', '2')),
+    'MAX_CONCURRENCY': int(os.getenv('WEBHOOK_MAX_CONCURRENCY', '32')),
+    'TARGET_DB_LATENCY': float(os.getenv('WEBHOOK_TARGET_DB_LATENCY', '0.05')),
+    'SOURCE_RATE': float(os.getenv('WEBHOOK_SOURCE_RATE', '50')),
+    'SOURCE_BURST': int(os.getenv('WEBHOOK_SOURCE_BURST', '100')),
+    'CONVERSATION_RATE': float(os.getenv('WEBHOOK_CONVERSATION_RATE', '10')),
+    'CONVERSATION_BURST': int(os.getenv('WEBHOOK_CONVERSATION_BURST', '20')),
+    'TRUST_PROXY_HEADERS': os.getenv('WEBHOOK_TRUST_PROXY_HEADERS', '0') == '1',
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
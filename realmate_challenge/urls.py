@@ -16,8 +16,11 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
+from .health import HealthzView, ReadyzView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('healthz', HealthzView.as_view()),
+    path('readyz', ReadyzView.as_view()),
     path('', include('realmate_challenge.conversations.urls')),
 ]